@@ -1,214 +1,670 @@
 import discord
-from discord.ext import commands
+import aiohttp
+from discord.ext import commands, tasks
 import yfinance as yf
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 import asyncio
 import io
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
-from matplotlib.patches import Rectangle
-import seaborn as sns
+import threading
+import time
+import pickle
+import sqlite3
+from collections import OrderedDict, deque
+from contextlib import closing
+import functools
 import logging
-from typing import Optional, Dict, Any
-import pytz
+from dataclasses import dataclass
+from typing import Optional, Dict, Any, List, Tuple
+from zoneinfo import ZoneInfo
 import os
 from dotenv import load_dotenv
 load_dotenv()
 
 logging.basicConfig(level=logging.INFO)
 
-plt.style.use('dark_background')
-sns.set_palette("husl")
+class TTLCache:
+    """Small thread-safe cache whose entries expire after `ttl` seconds"""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Any, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Any) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if time.monotonic() >= expires_at:
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Any, value: Any, ttl: Optional[float] = None):
+        with self._lock:
+            self._data[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+_ET_TZ = ZoneInfo('America/New_York')
+
+# Session names indexed by the codes stored in _SESSION_TABLE
+_SESSION_NAMES = (
+    "Regular Market Hours",
+    "Pre-Market",
+    "After-Hours",
+    "Market Closed",
+    "Weekend (Market Closed)",
+)
+
+def build_session_table() -> np.ndarray:
+    """Map every Eastern minute of the week (Monday 00:00 = 0) to a session code"""
+    minute_of_day = np.arange(24 * 60)
+    day = np.full(minute_of_day.shape, 3, dtype=np.uint8)
+    day[(minute_of_day >= 4 * 60) & (minute_of_day < 9 * 60 + 30)] = 1
+    day[(minute_of_day >= 9 * 60 + 30) & (minute_of_day < 16 * 60)] = 0
+    day[(minute_of_day >= 16 * 60) & (minute_of_day < 20 * 60)] = 2
+    weekend = np.full(minute_of_day.shape, 4, dtype=np.uint8)
+    return np.concatenate([day] * 5 + [weekend] * 2)
+
+_SESSION_TABLE = build_session_table()
+
+class HistoryDiskCache:
+    """SQLite-backed cache of price history frames that survives bot restarts"""
+
+    def __init__(self, path: str):
+        self.path = path
+        try:
+            with closing(sqlite3.connect(self.path)) as conn, conn:
+                conn.execute("CREATE TABLE IF NOT EXISTS history (key TEXT PRIMARY KEY, expires_at REAL, frame BLOB)")
+        except sqlite3.Error as e:
+            logging.error(f"Error opening history cache {self.path}: {e}")
+
+    def get(self, key: str) -> Optional[Tuple[pd.DataFrame, float]]:
+        """Return the cached frame with its expiry as a time.time() timestamp"""
+        try:
+            with closing(sqlite3.connect(self.path)) as conn:
+                row = conn.execute("SELECT expires_at, frame FROM history WHERE key = ?", (key,)).fetchone()
+        except sqlite3.Error as e:
+            logging.error(f"Error reading history cache for {key}: {e}")
+            return None
+
+        if row is None or time.time() >= row[0]:
+            return None
+        return pickle.loads(row[1]), row[0]
+
+    def set(self, key: str, frame: pd.DataFrame, ttl: float):
+        try:
+            with closing(sqlite3.connect(self.path)) as conn, conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO history (key, expires_at, frame) VALUES (?, ?, ?)",
+                    (key, time.time() + ttl, pickle.dumps(frame))
+                )
+        except sqlite3.Error as e:
+            logging.error(f"Error writing history cache for {key}: {e}")
+
+class AsyncRateLimiter:
+    """Allow at most `max_rate` acquisitions in any `period`-second window"""
+
+    def __init__(self, max_rate: int, period: float):
+        self.max_rate = max_rate
+        self.period = period
+        self._calls: deque = deque()
+        self._lock = asyncio.Lock()
+
+    async def __aenter__(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                while self._calls and now - self._calls[0] >= self.period:
+                    self._calls.popleft()
+                if len(self._calls) < self.max_rate:
+                    self._calls.append(now)
+                    return self
+                await asyncio.sleep(self.period - (now - self._calls[0]))
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+# Keep direct Yahoo requests under roughly 100 per minute
+_YAHOO_RATE_LIMITER = AsyncRateLimiter(100, 60)
+
+# Yahoo's chart endpoint carries a small quote summary in its `meta` block
+# and, unlike /v7/finance/quote, does not need a cookie/crumb pair
+_YAHOO_CHART_URL = "https://query1.finance.yahoo.com/v8/finance/chart/{symbol}"
+_YAHOO_HEADERS = {'User-Agent': 'Mozilla/5.0'}
+
+def history_ttl(interval: str) -> int:
+    """Seconds a history frame stays fresh: 1m bars 30s, other intraday 5min, daily 1h"""
+    if interval == '1m':
+        return 30
+    if interval.endswith(('m', 'h')):
+        return 300
+    return 3600
+
+# Ticker objects cache their own info/fast_info, so they are only reused briefly
+_TICKER_CACHE = TTLCache(maxsize=256, ttl=300)
+_HISTORY_MEMORY_CACHE = TTLCache(maxsize=256, ttl=3600)
+
+_HISTORY_DISK_CACHE = HistoryDiskCache(os.getenv("YF_CACHE_PATH", "yf_cache.sqlite"))
+
+# One figure is reused for every chart; matplotlib is not thread-safe, so
+# renders are serialized through _CHART_LOCK
+_CHART_LOCK = threading.Lock()
+
+@functools.lru_cache(maxsize=1)
+def chart_figure():
+    """Import matplotlib and build the shared chart figure on first use"""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.style
+    from cycler import cycler
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    matplotlib.style.use('dark_background')
+    matplotlib.rcParams['axes.prop_cycle'] = cycler(color=['#00d4aa', '#7289da', '#ff4757', '#00ff41', '#f1c40f'])
+
+    # Built outside pyplot so the figure never enters pyplot's figure registry
+    fig = Figure(figsize=(14, 7), facecolor='#2f3136')
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot(111)
+    ax2 = ax.twinx()
+    # Fixed margins replace a per-render tight_layout measuring pass
+    fig.subplots_adjust(left=0.08, right=0.92, top=0.92, bottom=0.15)
+    return fig, ax, ax2
+
+# Chart styling lookup tables indexed by int(price moved up)
+_CHART_LINE_COLORS = ('#ff4d4d', '#00ff7f')
+_CHART_FILL_COLORS = ('#ff4d4d33', '#00ff7f33')
+_CHART_CHANGE_SYMBOLS = ('▼', '▲')
+
+_STOCK_INFO_CACHE = TTLCache(maxsize=512, ttl=60)
+# Company name and P/E barely move intraday, so they outlive the price cache
+_DETAILS_CACHE = TTLCache(maxsize=512, ttl=3600)
+DETAIL_FIELDS = ('longName', 'trailingPE')
+_CHART_CACHE = TTLCache(maxsize=128, ttl=300)
+
+# Charts are downsampled to at most this many points before plotting
+CHART_MAX_POINTS = 800
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Pick `n_out` indices with Largest-Triangle-Three-Buckets downsampling"""
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    bucket_size = (n - 2) / (n_out - 2)
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        start = int(i * bucket_size) + 1
+        end = int((i + 1) * bucket_size) + 1
+        next_end = min(int((i + 2) * bucket_size) + 1, n)
+
+        # Average of the next bucket is the third corner of the triangle
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+
+        areas = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(areas.argmax())
+        selected[i + 1] = a
+
+    return selected
+
+def max_bucket_indices(y: np.ndarray, n_out: int) -> np.ndarray:
+    """Pick the index of the largest value in each of `n_out` equal buckets"""
+    n = len(y)
+    if n_out >= n:
+        return np.arange(n)
+
+    edges = np.linspace(0, n, n_out + 1).astype(np.int64)
+    return np.array([start + int(y[start:end].argmax()) for start, end in zip(edges[:-1], edges[1:])])
+
+@dataclass(slots=True)
+class StockQuote:
+    """Minimal price snapshot used by /compare"""
+    symbol: str
+    current_price: float
+    previous_close: float
+    price_change: float
+    percent_change: float
+
+    @classmethod
+    def from_prices(cls, symbol: str, current_price: float, previous_close: float) -> "StockQuote":
+        price_change = current_price - previous_close
+        percent_change = (price_change / previous_close) * 100 if previous_close != 0 else 0
+        return cls(symbol, current_price, previous_close, price_change, percent_change)
+
+@dataclass(slots=True, frozen=True)
+class StockSnapshot:
+    """Full quote and day stats used by /price"""
+    symbol: str
+    company_name: str
+    current_price: float
+    previous_close: float
+    price_change: float
+    percent_change: float
+    day_high: float
+    day_low: float
+    volume: int
+    market_cap: Optional[float]
+    pe_ratio: Optional[float]
+    market_session: str
+    last_update: datetime
+    hist_data: pd.DataFrame
 
 class StockData:
     """Handle stock data fetching and analysis"""
     
     @staticmethod
-    def get_stock_info(symbol: str) -> Optional[Dict[str, Any]]:
-        """Get comprehensive stock information"""
+    def get_stock_info(symbol: str, include_details: bool = False) -> Optional[StockSnapshot]:
+        """Get comprehensive stock information
+
+        Price fields come from the lightweight `fast_info` quote; the heavy
+        `info` lookup (company name, P/E) only runs when `include_details` is set.
+        """
+        cache_key = (symbol.upper(), include_details)
+        cached = _STOCK_INFO_CACHE.get(cache_key)
+        if cached is not None:
+            return cached
+
         try:
-            ticker = yf.Ticker(symbol.upper())
+            ticker = StockData.get_ticker(symbol)
 
-            info = ticker.info
+            fast_info = ticker.fast_info
+            info = StockData.get_details(ticker) if include_details else {}
 
-            hist_1d = ticker.history(period='1d', interval='1m')
-            hist_5d = ticker.history(period='5d', interval='15m')
+            hist_1d = StockData.get_history(ticker, '1d', '1m')
+            hist_5d = StockData.get_history(ticker, '5d', '15m')
             
             if hist_1d.empty and hist_5d.empty:
                 return None
 
             current_data = hist_1d if not hist_1d.empty else hist_5d
 
-            current_price = current_data['Close'].iloc[-1] if not current_data.empty else info.get('currentPrice', 0)
+            close = current_data['Close'].to_numpy()
+            current_price = close[-1]
 
-            previous_close = info.get('previousClose', current_price)
+            previous_close = fast_info['previous_close'] or current_price
 
             price_change = current_price - previous_close
             percent_change = (price_change / previous_close) * 100 if previous_close != 0 else 0
 
             market_session = StockData.get_market_session()
 
-            day_high = current_data['High'].max() if not current_data.empty else info.get('dayHigh', current_price)
-            day_low = current_data['Low'].min() if not current_data.empty else info.get('dayLow', current_price)
-            volume = current_data['Volume'].sum() if not current_data.empty else info.get('volume', 0)
+            day_high = current_data['High'].to_numpy().max()
+            day_low = current_data['Low'].to_numpy().min()
+            volume = current_data['Volume'].to_numpy().sum()
             
-            return {
-                'symbol': symbol.upper(),
-                'company_name': info.get('longName', symbol.upper()),
-                'current_price': current_price,
-                'previous_close': previous_close,
-                'price_change': price_change,
-                'percent_change': percent_change,
-                'day_high': day_high,
-                'day_low': day_low,
-                'volume': volume,
-                'market_cap': info.get('marketCap'),
-                'pe_ratio': info.get('trailingPE'),
-                'market_session': market_session,
-                'last_update': datetime.now(),
-                'hist_data': current_data
-            }
+            stock_info = StockSnapshot(
+                symbol=symbol.upper(),
+                company_name=info.get('longName', symbol.upper()),
+                current_price=current_price,
+                previous_close=previous_close,
+                price_change=price_change,
+                percent_change=percent_change,
+                day_high=day_high,
+                day_low=day_low,
+                volume=volume,
+                market_cap=fast_info['market_cap'],
+                pe_ratio=info.get('trailingPE'),
+                market_session=market_session,
+                last_update=datetime.now(),
+                hist_data=current_data,
+            )
+            _STOCK_INFO_CACHE.set(cache_key, stock_info)
+
+            return stock_info
             
         except Exception as e:
             logging.error(f"Error fetching data for {symbol}: {e}")
             return None
     
     @staticmethod
-    def get_market_session() -> str:
-        """Determine current market session"""
-        now = datetime.now(pytz.timezone('US/Eastern'))
-        current_time = now.time()
-        weekday = now.weekday()
+    def get_details(ticker: yf.Ticker) -> Dict[str, Any]:
+        """Return the few `info` fields the bot displays
+
+        Only this subset is cached, so each detail entry stays a few bytes
+        instead of holding the full `info` payload.
+        """
+        symbol = ticker.ticker.upper()
+        cached = _DETAILS_CACHE.get(symbol)
+        if cached is not None:
+            return cached
+
+        info = ticker.info
+        details = {field: info.get(field) for field in DETAIL_FIELDS if info.get(field) is not None}
+        _DETAILS_CACHE.set(symbol, details)
+        return details
 
-        if weekday >= 5: 
-            return "Weekend (Market Closed)"
+    @staticmethod
+    def get_ticker(symbol: str) -> yf.Ticker:
+        """Get a recently used Ticker for `symbol` or create a new one"""
+        symbol = symbol.upper()
+        ticker = _TICKER_CACHE.get(symbol)
+        if ticker is None:
+            ticker = yf.Ticker(symbol)
+            _TICKER_CACHE.set(symbol, ticker)
+        return ticker
+
+    @staticmethod
+    def get_history(ticker: yf.Ticker, period: str, interval: str) -> pd.DataFrame:
+        """Get price history from memory, then the on-disk cache, then Yahoo"""
+        cache_key = f"{ticker.ticker.upper()}|{period}|{interval}"
+        data = _HISTORY_MEMORY_CACHE.get(cache_key)
+        if data is not None:
+            return data
+
+        cached = _HISTORY_DISK_CACHE.get(cache_key)
+        if cached is not None:
+            # Keep it in memory too, expiring no later than the disk entry
+            data, expires_at = cached
+            _HISTORY_MEMORY_CACHE.set(cache_key, data, max(0.0, expires_at - time.time()))
+            return data
+
+        data = ticker.history(period=period, interval=interval)
+        if not data.empty:
+            ttl = history_ttl(interval)
+            _HISTORY_MEMORY_CACHE.set(cache_key, data, ttl)
+            _HISTORY_DISK_CACHE.set(cache_key, data, ttl)
+
+        return data
 
-        market_open = datetime.strptime("09:30", "%H:%M").time()
-        market_close = datetime.strptime("16:00", "%H:%M").time()
+    @staticmethod
+    def get_many(symbols: List[str]) -> Dict[str, Optional[StockQuote]]:
+        """Get price data for several stocks with one batched download
 
-        premarket_start = datetime.strptime("04:00", "%H:%M").time()
+        Two days of bars are fetched so the previous close comes from the same
+        request instead of a separate quote lookup per symbol.
+        """
+        symbols = [s.upper() for s in symbols]
+        results: Dict[str, Optional[StockQuote]] = {s: None for s in symbols}
 
-        afterhours_end = datetime.strptime("20:00", "%H:%M").time()
-        
-        if market_open <= current_time <= market_close:
-            return "Regular Market Hours"
-        elif premarket_start <= current_time < market_open:
-            return "Pre-Market"
-        elif market_close < current_time <= afterhours_end:
-            return "After-Hours"
-        else:
-            return "Market Closed"
+        try:
+            data = yf.download(symbols, period='2d', interval='1m', group_by='ticker', threads=True, progress=False)
+        except Exception as e:
+            logging.error(f"Error fetching batch data for {', '.join(symbols)}: {e}")
+            return results
+
+        if data.empty:
+            return results
+
+        days = data.index.normalize()
+        is_last_day = (days == days[-1])
+
+        for symbol in symbols:
+            try:
+                if isinstance(data.columns, pd.MultiIndex):
+                    if symbol not in data.columns.get_level_values(0):
+                        continue
+                    close = data[symbol]['Close'].to_numpy()
+                else:
+                    close = data['Close'].to_numpy()
+
+                # Symbols in a batch share one index, so some bars can be NaN
+                has_close = ~np.isnan(close)
+                last_day_close = close[has_close & is_last_day]
+                prior_day_close = close[has_close & ~is_last_day]
+                if last_day_close.size == 0:
+                    continue
+
+                current_price = last_day_close[-1]
+                previous_close = prior_day_close[-1] if prior_day_close.size else current_price
+
+                results[symbol] = StockQuote.from_prices(symbol, current_price, previous_close)
+
+            except Exception as e:
+                logging.error(f"Error processing batch data for {symbol}: {e}")
+
+        return results
+
+    @staticmethod
+    async def get_quotes(session: aiohttp.ClientSession, symbols: List[str]) -> Dict[str, Optional[StockQuote]]:
+        """Get current price data for several stocks from Yahoo's lightweight chart meta"""
+        symbols = [s.upper() for s in symbols]
+
+        async def fetch_quote(symbol: str) -> Optional[StockQuote]:
+            try:
+                async with _YAHOO_RATE_LIMITER, session.get(_YAHOO_CHART_URL.format(symbol=symbol), params={'range': '1d', 'interval': '1d'}) as response:
+                    if response.status != 200:
+                        logging.error(f"Quote request for {symbol} failed: {response.status}")
+                        return None
+                    payload = await response.json()
+
+                meta = payload['chart']['result'][0]['meta']
+                current_price = meta['regularMarketPrice']
+                previous_close = meta.get('previousClose') or meta.get('chartPreviousClose') or current_price
+
+                return StockQuote.from_prices(symbol, current_price, previous_close)
+
+            except Exception as e:
+                logging.error(f"Error fetching quote for {symbol}: {e}")
+                return None
+
+        quotes = await asyncio.gather(*[fetch_quote(symbol) for symbol in symbols])
+
+        return dict(zip(symbols, quotes))
+
+    @staticmethod
+    def get_market_session() -> str:
+        """Determine current market session"""
+        # Session boundaries fall on whole minutes, so the minute of the week
+        # indexes straight into the precomputed table
+        now = datetime.now(_ET_TZ)
+        minute_of_week = now.weekday() * 1440 + now.hour * 60 + now.minute
+        return _SESSION_NAMES[_SESSION_TABLE[minute_of_week]]
     
     @staticmethod
     def create_price_chart(symbol: str, period: str = '1d') -> Optional[io.BytesIO]:
+        buffer, _ = StockData.fetch_and_chart(symbol, period)
+        return buffer
+
+    @staticmethod
+    def fetch_and_chart(symbol: str, period: str = '1d') -> Tuple[Optional[io.BytesIO], Optional[Dict[str, Any]]]:
+        """Render a price chart and build its stock info from the same history"""
+        cache_key = (symbol.upper(), period)
+        cached = _CHART_CACHE.get(cache_key)
+        if cached is not None:
+            cached_png, cached_info = cached
+            return io.BytesIO(cached_png), cached_info
+
         try:
-            ticker = yf.Ticker(symbol)
+            ticker = StockData.get_ticker(symbol)
 
             # Set data interval based on period
             if period == '1d':
-                data = ticker.history(period='1d', interval='1m')
+                data = StockData.get_history(ticker, '1d', '1m')
                 title_period = "Today"
             elif period == '5d':
-                data = ticker.history(period='5d', interval='15m')
+                data = StockData.get_history(ticker, '5d', '15m')
                 title_period = "5 Days"
             elif period == '1mo':
-                data = ticker.history(period='1mo', interval='1h')
+                data = StockData.get_history(ticker, '1mo', '1h')
                 title_period = "1 Month"
             elif period == '3mo':
-                data = ticker.history(period='3mo', interval='1d')
+                data = StockData.get_history(ticker, '3mo', '1d')
                 title_period = "3 Months"
             else:
-                return None # Invalid period
+                return None, None # Invalid period
 
             if data.empty:
-                return None
+                return None, None
+
+            # Raw arrays feed both the stats and matplotlib, skipping pandas'
+            # plotting converters; dates become naive UTC datetime64 as before
+            index = data.index
+            if index.tz is not None:
+                index = index.tz_convert('UTC').tz_localize(None)
+            dates = index.to_numpy()
+            timestamps = dates.astype(np.int64)
+            close = data['Close'].to_numpy()
+            volume = data['Volume'].to_numpy()
+            current_price, start_price = close[-1], close[0]
+            close_min, volume_max = close.min(), volume.max()
+
+            # Plot a downsampled view; the stats above keep full resolution
+            plot_index = dates
+            plot_close = close
+            volume_index = dates
+            plot_volume = volume
+            if len(close) > CHART_MAX_POINTS:
+                selected = lttb_indices((timestamps - timestamps[0]).astype(np.float64), close, CHART_MAX_POINTS)
+                plot_index = dates[selected]
+                plot_close = close[selected]
+
+                # Volume keeps each bucket's peak so spikes survive downsampling
+                volume_selected = max_bucket_indices(volume, CHART_MAX_POINTS)
+                volume_index = dates[volume_selected]
+                plot_volume = volume[volume_selected]
 
             # Determine price direction for color
-            current_price = data['Close'].iloc[-1]
-            start_price = data['Close'].iloc[0]
-            price_change_dir = 'up' if current_price >= start_price else 'down'
-            line_color = '#00ff7f' if price_change_dir == 'up' else '#ff4d4d'
-            fill_color_start = '#00ff7f33' if price_change_dir == 'up' else '#ff4d4d33'
-            fill_color_end = '#2f3136'
-
-            # Set up the plot
-            plt.style.use('dark_background')
-            fig, ax = plt.subplots(figsize=(14, 7), facecolor='#2f3136')
-            ax.set_facecolor('#2f3136')
-
-            # Price line plot
-            ax.plot(data.index, data['Close'], color=line_color, linewidth=2.5, label='Price')
-
-            ax.fill_between(data.index, data['Close'], data['Close'].min(),
-                            where=data['Close'] >= data['Close'].min(), interpolate=True,
-                            color=fill_color_start, alpha=0.3)
-
-            ax.axhline(y=start_price, color='#ffffff', linestyle='--', linewidth=1, alpha=0.5, label='Start Price')
-
-            # Volume bars on a secondary axis
-            ax2 = ax.twinx()
-            ax2.bar(data.index, data['Volume'], color=line_color, alpha=0.3, width=0.0008, label='Volume')
-            ax2.set_ylabel('Volume', color=line_color, fontsize=12)
-            ax2.tick_params(axis='y', labelcolor=line_color)
-            ax2.set_ylim(0, data['Volume'].max() * 3) # Make volume bars smaller
-            ax2.grid(False)
-
-            # Title and labels
-            ax.set_title(f'Price Chart for {symbol.upper()} ({title_period})', fontsize=20, color='white', fontweight='bold')
-            ax.set_xlabel('Time', fontsize=12, color='white')
-            ax.set_ylabel('Price ($)', fontsize=12, color='white')
-
-            # Axis styling
-            ax.tick_params(axis='x', colors='white', labelsize=10)
-            ax.tick_params(axis='y', colors='white', labelsize=10)
-            ax.spines['bottom'].set_color('white')
-            ax.spines['left'].set_color('white')
-            ax.spines['top'].set_visible(False)
-            ax.spines['right'].set_visible(False)
-
-            # Format the x-axis for better readability
-            if period == '1d':
-                ax.xaxis.set_major_formatter(mdates.DateFormatter('%H:%M'))
-            else:
-                ax.xaxis.set_major_formatter(mdates.DateFormatter('%b %d'))
-
-            plt.xticks(rotation=45, ha='right')
-            ax.grid(True, linestyle='--', alpha=0.2)
-
-            # Info box with price change
-            price_change = current_price - start_price
-            percent_change = (price_change / start_price) * 100 if start_price != 0 else 0
+            direction = int(current_price >= start_price)
+            line_color = _CHART_LINE_COLORS[direction]
+            fill_color_start = _CHART_FILL_COLORS[direction]
+
+            # Plotting modules load on the first chart, keeping them out of
+            # /price and /compare
+            import matplotlib.dates as mdates
+            from PIL import Image
+
+            with _CHART_LOCK:
+                # Reset the shared figure for this render
+                fig, ax, ax2 = chart_figure()
+                ax.clear()
+                ax2.clear()
+                ax.set_facecolor('#2f3136')
+                ax2.patch.set_visible(False)
+                ax2.yaxis.tick_right()
+                ax2.yaxis.set_label_position('right')
+
+                # Price line plot
+                ax.plot(plot_index, plot_close, color=line_color, linewidth=2.5, label='Price')
+
+                # Every close is >= the minimum, so the fill needs no mask
+                ax.fill_between(plot_index, plot_close, close_min,
+                                color=fill_color_start, alpha=0.3)
+
+                ax.axhline(y=start_price, color='#ffffff', linestyle='--', linewidth=1, alpha=0.5, label='Start Price')
+
+                # Volume bars on a secondary axis
+                ax2.bar(volume_index, plot_volume, color=line_color, alpha=0.3, width=0.0008, label='Volume')
+                ax2.set_ylabel('Volume', color=line_color, fontsize=12)
+                ax2.tick_params(axis='y', labelcolor=line_color)
+                ax2.set_ylim(0, volume_max * 3) # Make volume bars smaller
+                ax2.grid(False)
+
+                # Title and labels
+                ax.set_title(f'Price Chart for {symbol.upper()} ({title_period})', fontsize=20, color='white', fontweight='bold')
+                ax.set_xlabel('Time', fontsize=12, color='white')
+                ax.set_ylabel('Price ($)', fontsize=12, color='white')
+
+                # Axis styling
+                ax.tick_params(axis='x', colors='white', labelsize=10)
+                ax.tick_params(axis='y', colors='white', labelsize=10)
+                ax.spines['bottom'].set_color('white')
+                ax.spines['left'].set_color('white')
+                ax.spines['top'].set_visible(False)
+                ax.spines['right'].set_visible(False)
+
+                # Format the x-axis for better readability
+                ax.xaxis.set_major_locator(mdates.AutoDateLocator(maxticks=10))
+                if period == '1d':
+                    ax.xaxis.set_major_formatter(mdates.DateFormatter('%H:%M'))
+                else:
+                    ax.xaxis.set_major_formatter(mdates.DateFormatter('%b %d'))
+
+                ax.tick_params(axis='x', labelrotation=45)
+                for label in ax.get_xticklabels():
+                    label.set_horizontalalignment('right')
+                ax.grid(True, linestyle='--', alpha=0.2)
+
+                # Info box with price change
+                price_change = current_price - start_price
+                percent_change = (price_change / start_price) * 100 if start_price != 0 else 0
             
-            change_symbol = '▲' if price_change >= 0 else '▼'
-            change_text = f'{change_symbol} {abs(price_change):.2f} ({abs(percent_change):.2f}%)'
+                change_symbol = _CHART_CHANGE_SYMBOLS[int(price_change >= 0)]
+                change_text = f'{change_symbol} {abs(price_change):.2f} ({abs(percent_change):.2f}%)'
             
-            info_text = f'Current Price: ${current_price:.2f}\nChange: {change_text}'
+                info_text = f'Current Price: ${current_price:.2f}\nChange: {change_text}'
             
-            bbox_props = dict(boxstyle='round,pad=0.5', facecolor='#1e1e1e', alpha=0.9, edgecolor='none')
-            ax.text(0.02, 0.95, info_text, transform=ax.transAxes, fontsize=14, color=line_color,
-                    fontweight='bold', verticalalignment='top', bbox=bbox_props)
-
-            plt.tight_layout()
+                bbox_props = dict(boxstyle='round,pad=0.5', facecolor='#1e1e1e', alpha=0.9, edgecolor='none')
+                ax.text(0.02, 0.95, info_text, transform=ax.transAxes, fontsize=14, color=line_color,
+                        fontweight='bold', verticalalignment='top', bbox=bbox_props)
             
-            # Save to buffer
-            buffer = io.BytesIO()
-            plt.savefig(buffer, format='png', facecolor='#2f3136')
-            buffer.seek(0)
-            plt.close(fig)
+                # Encode the Agg pixel buffer straight to PNG; the figure is
+                # opaque, so the alpha channel is dropped before encoding
+                fig.canvas.draw()
+                image = Image.frombuffer('RGBA', fig.canvas.get_width_height(), fig.canvas.buffer_rgba(), 'raw', 'RGBA', 0, 1).convert('RGB')
+                png_buffer = io.BytesIO()
+                image.save(png_buffer, format='PNG', compress_level=3)
+                png_bytes = png_buffer.getvalue()
+
+            buffer = io.BytesIO(png_bytes)
+
+            previous_close = ticker.fast_info['previous_close'] or current_price
+            day_change = current_price - previous_close
+
+            stock_info = {
+                'symbol': symbol.upper(),
+                'current_price': current_price,
+                'previous_close': previous_close,
+                'price_change': day_change,
+                'percent_change': (day_change / previous_close) * 100 if previous_close != 0 else 0,
+                'market_session': StockData.get_market_session(),
+                'last_update': datetime.now(),
+            }
+
+            _CHART_CACHE.set(cache_key, (png_bytes, stock_info))
             
-            return buffer
+            return buffer, stock_info
 
         except Exception as e:
             logging.error(f"Error creating chart for {symbol}: {e}")
-            return None
+            return None, None
 
 class StockBot(commands.Bot):
     def __init__(self):
         intents = discord.Intents.default()
         intents.message_content = True
         super().__init__(command_prefix='!', intents=intents)
+        self._market_session: Optional[str] = None
+        self.http_session: Optional[aiohttp.ClientSession] = None
+
+    async def setup_hook(self):
+        connector = aiohttp.TCPConnector(limit=128, limit_per_host=16, ttl_dns_cache=300)
+        self.http_session = aiohttp.ClientSession(
+            connector=connector,
+            headers=_YAHOO_HEADERS,
+            timeout=aiohttp.ClientTimeout(total=10)
+        )
+        self.refresh_market_session.start()
+
+    async def close(self):
+        self.refresh_market_session.cancel()
+        if self.http_session is not None:
+            await self.http_session.close()
+        await super().close()
+
+    @tasks.loop(seconds=30)
+    async def refresh_market_session(self):
+        """Keep the market session prewarmed so commands can read it directly"""
+        self._market_session = StockData.get_market_session()
+
+    @property
+    def market_session(self) -> str:
+        if self._market_session is None:
+            self._market_session = StockData.get_market_session()
+        return self._market_session
     
     async def on_ready(self):
         print(f'{self.user} has connected to Discord!')
@@ -226,63 +682,70 @@ class StockBot(commands.Bot):
 
 bot = StockBot()
 
+# Bounds how many blocking Yahoo fetches run in worker threads at once
+_FETCH_SEMAPHORE = asyncio.Semaphore(8)
+
+async def run_blocking(func, *args):
+    """Run a blocking fetch in a worker thread so the event loop stays free"""
+    async with _FETCH_SEMAPHORE:
+        return await asyncio.to_thread(func, *args)
+
+# Lookup tables indexed by int(price_change >= 0)
+_CHANGE_COLORS = (0xff4757, 0x00ff41)
+_CHANGE_EMOJIS = ("📉", "📈")
+_CHANGE_SIGNS = ("", "+")
+_CHANGE_VALUE_FMT = "**${0:.2f}**\n{1}${2:.2f} ({1}{3:.2f}%)"
+
+def format_change(current_price: float, price_change: float, percent_change: float) -> Tuple[int, str, str]:
+    """Return the embed color, emoji and price/change text for a price move"""
+    idx = int(price_change >= 0)
+    value_text = _CHANGE_VALUE_FMT.format(current_price, _CHANGE_SIGNS[idx], price_change, percent_change)
+    return _CHANGE_COLORS[idx], _CHANGE_EMOJIS[idx], value_text
+
 @bot.tree.command(name="price", description="Get current stock price and basic info")
 async def price_command(interaction: discord.Interaction, symbol: str):
     """Get current stock price"""
     await interaction.response.defer()
     
     try:
-        stock_data = StockData.get_stock_info(symbol)
+        stock_data = await run_blocking(StockData.get_stock_info, symbol, True)
         
         if not stock_data:
             await interaction.followup.send(f"❌ Could not find data for symbol: {symbol.upper()}")
             return
 
-        embed = discord.Embed(
-            title=f"📈 {stock_data['symbol']} - {stock_data['company_name']}",
-            color=0x00ff41 if stock_data['price_change'] >= 0 else 0xff4757,
-            timestamp=datetime.now()
+        change_color, change_emoji, change_text = format_change(
+            stock_data.current_price, stock_data.price_change, stock_data.percent_change
         )
 
-        change_emoji = "📈" if stock_data['price_change'] >= 0 else "📉"
-        change_symbol = "+" if stock_data['price_change'] >= 0 else ""
-        
-        embed.add_field(
-            name=f"{change_emoji} Current Price",
-            value=f"**${stock_data['current_price']:.2f}**\n{change_symbol}${stock_data['price_change']:.2f} ({change_symbol}{stock_data['percent_change']:.2f}%)",
-            inline=True
-        )
-        
-        embed.add_field(
-            name="📊 Day Range",
-            value=f"**High:** ${stock_data['day_high']:.2f}\n**Low:** ${stock_data['day_low']:.2f}",
-            inline=True
-        )
-        
-        embed.add_field(
-            name="📋 Previous Close",
-            value=f"${stock_data['previous_close']:.2f}",
-            inline=True
-        )
+        fields = [
+            {'name': f"{change_emoji} Current Price", 'value': change_text, 'inline': True},
+            {'name': "📊 Day Range",
+             'value': f"**High:** ${stock_data.day_high:.2f}\n**Low:** ${stock_data.day_low:.2f}",
+             'inline': True},
+            {'name': "📋 Previous Close", 'value': f"${stock_data.previous_close:.2f}", 'inline': True},
+        ]
 
-        if stock_data['volume']:
-            volume_formatted = f"{stock_data['volume']:,}"
-            embed.add_field(name="📊 Volume", value=volume_formatted, inline=True)
-        
-        if stock_data['market_cap']:
-            market_cap_b = stock_data['market_cap'] / 1e9
-            embed.add_field(name="💰 Market Cap", value=f"${market_cap_b:.2f}B", inline=True)
+        if stock_data.volume:
+            fields.append({'name': "📊 Volume", 'value': f"{stock_data.volume:,}", 'inline': True})
         
-        if stock_data['pe_ratio']:
-            embed.add_field(name="📈 P/E Ratio", value=f"{stock_data['pe_ratio']:.2f}", inline=True)
-
-        embed.add_field(
-            name="🕐 Market Status",
-            value=stock_data['market_session'],
-            inline=False
-        )
+        if stock_data.market_cap:
+            market_cap_b = stock_data.market_cap / 1e9
+            fields.append({'name': "💰 Market Cap", 'value': f"${market_cap_b:.2f}B", 'inline': True})
         
-        embed.set_footer(text="Data provided by Yahoo Finance")
+        if stock_data.pe_ratio:
+            fields.append({'name': "📈 P/E Ratio", 'value': f"{stock_data.pe_ratio:.2f}", 'inline': True})
+
+        fields.append({'name': "🕐 Market Status", 'value': stock_data.market_session, 'inline': False})
+
+        # Assemble the whole embed in one pass rather than field by field
+        embed = discord.Embed.from_dict({
+            'title': f"📈 {stock_data.symbol} - {stock_data.company_name}",
+            'color': change_color,
+            'timestamp': datetime.now().astimezone().isoformat(),
+            'fields': fields,
+            'footer': {'text': "Data provided by Yahoo Finance"},
+        })
         
         await interaction.followup.send(embed=embed)
         
@@ -300,15 +763,13 @@ async def chart_command(interaction: discord.Interaction, symbol: str, period: s
         return
     
     try:
-        chart_buffer = StockData.create_price_chart(symbol, period)
+        chart_buffer, stock_data = await run_blocking(StockData.fetch_and_chart, symbol, period)
         
         if not chart_buffer:
             await interaction.followup.send(f"❌ Could not create chart for {symbol.upper()}")
             return
         
         file = discord.File(chart_buffer, filename=f"{symbol.upper()}_{period}_chart.png")
-
-        stock_data = StockData.get_stock_info(symbol)
         
         if stock_data:
             embed = discord.Embed(
@@ -349,17 +810,18 @@ async def compare_command(interaction: discord.Interaction, symbols: str):
             timestamp=datetime.now()
         )
         
+        batch_data = await StockData.get_quotes(bot.http_session, symbol_list)
+
+        missing = [symbol for symbol, quote in batch_data.items() if quote is None]
+        if missing:
+            batch_data.update(await run_blocking(StockData.get_many, missing))
+
         for symbol in symbol_list:
-            stock_data = StockData.get_stock_info(symbol)
+            stock_data = batch_data.get(symbol)
             
             if stock_data:
-                change_emoji = "📈" if stock_data['price_change'] >= 0 else "📉"
-                change_symbol = "+" if stock_data['price_change'] >= 0 else ""
-                
-                value_text = (
-                    f"**${stock_data['current_price']:.2f}**\n"
-                    f"{change_symbol}${stock_data['price_change']:.2f} "
-                    f"({change_symbol}{stock_data['percent_change']:.2f}%)"
+                _, change_emoji, value_text = format_change(
+                    stock_data.current_price, stock_data.price_change, stock_data.percent_change
                 )
                 
                 embed.add_field(
@@ -374,56 +836,56 @@ async def compare_command(interaction: discord.Interaction, symbols: str):
                     inline=True
                 )
         
-        market_session = StockData.get_market_session()
-        embed.set_footer(text=f"Market Status: {market_session}")
+        embed.set_footer(text=f"Market Status: {bot.market_session}")
         
         await interaction.followup.send(embed=embed)
         
     except Exception as e:
         await interaction.followup.send(f"❌ Error comparing stocks: {str(e)}")
 
+# The help text is static, so the embed is built once at import
+_HELP_EMBED = discord.Embed(
+    title="🤖 Stock Bot Commands",
+    description="Get real-time stock data and charts!",
+    color=0x00d4aa
+)
+
+_HELP_EMBED.add_field(
+    name="/price <symbol>",
+    value="Get current price and basic info for a stock\nExample: `/price AAPL`",
+    inline=False
+)
+
+_HELP_EMBED.add_field(
+    name="/chart <symbol> [period]",
+    value="Get a price chart for a stock\nPeriods: `1d`, `5d`, `1mo`, `3mo`\nExample: `/chart TSLA 5d`",
+    inline=False
+)
+
+_HELP_EMBED.add_field(
+    name="/compare <symbols>",
+    value="Compare multiple stocks (comma-separated)\nExample: `/compare AAPL,GOOGL,MSFT`",
+    inline=False
+)
+
+_HELP_EMBED.add_field(
+    name="📊 Features",
+    value=(
+        "• Works 24/7 (shows pre/post market data)\n"
+        "• Real-time price updates\n"
+        "• Beautiful charts and graphs\n"
+        "• Market session indicators\n"
+        "• Compare up to 5 stocks at once"
+    ),
+    inline=False
+)
+
+_HELP_EMBED.set_footer(text="Data provided by Yahoo Finance • Bot made with ❤️")
+
 @bot.tree.command(name="help", description="Show available commands")
 async def help_command(interaction: discord.Interaction):
     """Show help information"""
-    embed = discord.Embed(
-        title="🤖 Stock Bot Commands",
-        description="Get real-time stock data and charts!",
-        color=0x00d4aa
-    )
-    
-    embed.add_field(
-        name="/price <symbol>",
-        value="Get current price and basic info for a stock\nExample: `/price AAPL`",
-        inline=False
-    )
-    
-    embed.add_field(
-        name="/chart <symbol> [period]",
-        value="Get a price chart for a stock\nPeriods: `1d`, `5d`, `1mo`, `3mo`\nExample: `/chart TSLA 5d`",
-        inline=False
-    )
-    
-    embed.add_field(
-        name="/compare <symbols>",
-        value="Compare multiple stocks (comma-separated)\nExample: `/compare AAPL,GOOGL,MSFT`",
-        inline=False
-    )
-    
-    embed.add_field(
-        name="📊 Features",
-        value=(
-            "• Works 24/7 (shows pre/post market data)\n"
-            "• Real-time price updates\n"
-            "• Beautiful charts and graphs\n"
-            "• Market session indicators\n"
-            "• Compare up to 5 stocks at once"
-        ),
-        inline=False
-    )
-    
-    embed.set_footer(text="Data provided by Yahoo Finance • Bot made with ❤️")
-    
-    await interaction.response.send_message(embed=embed)
+    await interaction.response.send_message(embed=_HELP_EMBED)
 
 if __name__ == "__main__":
     BOT_TOKEN = os.getenv("DISCORD_TOKEN")
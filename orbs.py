@@ -2,17 +2,25 @@ import pandas as pd
 from pandas import Timestamp
 import numpy as np
 import yfinance as yf
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, date, time as dt_time
+from zoneinfo import ZoneInfo
 import time
 import smtplib
+import atexit
 from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import aiohttp
+import asyncio
 import json
+import re
 from dataclasses import dataclass
-from typing import Optional, Tuple, List, Callable
+from typing import Optional, Tuple, List, Dict, Set, Callable
 import threading
+from concurrent.futures import ThreadPoolExecutor
 import os
+from pathlib import Path
 from dotenv import load_dotenv
 import tkinter as tk
 from tkinter import scrolledtext, messagebox
@@ -20,16 +28,58 @@ import queue
 
 load_dotenv()
 
+# Market hours and Yahoo's bar timestamps are both in exchange time
+EASTERN_TZ = ZoneInfo('America/New_York')
+
+# Webhook bodies are encoded once and posted as raw bytes
+JSON_HEADERS = {'Content-Type': 'application/json'}
+
+# Names of the bar files store_bars writes: <symbol>_<interval>_<YYYY-MM-DD>.pkl
+BAR_CACHE_FILE_PATTERN = re.compile(r'.+_\d+[mhd]_(\d{4}-\d{2}-\d{2})\.pkl')
+
+# Discord rejects webhook messages longer than this many characters
+DISCORD_MESSAGE_LIMIT = 2000
+
+# Signal notification layout, filled per signal with str.format_map
+SIGNAL_TITLE_TEMPLATE = "🚨 {symbol} {signal_type} SIGNAL - ORBS Breakout"
+SIGNAL_MESSAGE_TEMPLATE = """🎯 ORBS BREAKOUT SIGNAL
+━━━━━━━━━━━━━━━━━━━━
+📈 Symbol: {symbol}
+🎨 Signal: {signal_type} Options
+📊 Direction: {direction}
+⏰ Timeframe: {timeframe}
+💰 Current Price: ${current_price:.2f}
+
+📋 ORB Details:
+• ORB High: ${orb_high:.2f}
+• ORB Low: ${orb_low:.2f}
+• ORB Width: ${orb_width:.2f}
+• ORB Period: {orb_start} - {orb_end}
+
+🔍 Entry Reason:
+{entry_reason}
+
+🎯 Suggested Action:
+Buy {signal_type} options on Robinhood
+
+⏱️ Signal Time: {signal_time:%Y-%m-%d %H:%M:%S}"""
+
+# Signal type, direction and entry reason template for each breakout type
+SIGNAL_STYLES = {
+    "BULLISH": ("CALL", "🟢 LONG", "Price broke above ORB high (${orb_high:.2f})"),
+    "BEARISH": ("PUT", "🔴 SHORT", "Price broke below ORB low (${orb_low:.2f})"),
+}
+UNKNOWN_SIGNAL_STYLE = ("UNKNOWN", "❓UNKNOWN", "Unknown breakout type")
+
 class TradingApp:
 
     def __init__(self, bot):
         self.bot = bot
         self.bot_thread = None
         self.is_running = False
-        
-        
-        self.message_queue = queue.Queue()
-        
+        # Set when the window is destroyed; log lines are dropped from then on
+        # rather than handed to a Tk main loop that is no longer running
+        self.closed = False
 
         self.window = tk.Tk()
         self.window.title('ORBS Trading Bot')
@@ -59,19 +109,25 @@ class TradingApp:
         self.exit_button.pack(side='left', expand=True, padx=5)
 
         self.window.protocol("WM_DELETE_WINDOW", self.exit_app)
+        self.window.bind('<Destroy>', self.on_destroy, add='+')
 
         self.bot.set_logging_callback(self.log_message)
 
-        self.window.after(100, self.check_queue)
-    
-    def check_queue(self):
-        while not self.message_queue.empty():
-            message = self.message_queue.get()
-            self.log_to_gui(message)
-        self.window.after(100, self.check_queue)
+    def on_destroy(self, event):
+        # <Destroy> also fires for every child widget
+        if event.widget is self.window:
+            self.closed = True
 
     def log_message(self, message):
-        self.message_queue.put(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] {message}")
+        # Called from the bot thread too; Tk hands after() calls to the main
+        # loop, so the GUI updates as soon as it is idle without polling
+        if self.closed:
+            return
+        try:
+            self.window.after(0, self.log_to_gui, f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] {message}")
+        except (RuntimeError, tk.TclError):
+            # The window was destroyed between the check and the call
+            pass
         
     def log_to_gui(self, message):
         self.output_text.config(state=tk.NORMAL)
@@ -80,6 +136,11 @@ class TradingApp:
         self.output_text.config(state=tk.DISABLED)
 
     def start_bot(self):
+        if self.bot_thread and self.bot_thread.is_alive():
+            # Two runs would share the notifier's event-loop session
+            self.log_message("The previous run is still stopping. Try again in a moment.")
+            return
+        
         if not self.is_running:
             self.is_running = True
             self.bot.should_run = True
@@ -92,7 +153,7 @@ class TradingApp:
     def stop_bot(self):
         if self.is_running:
             self.is_running = False
-            self.bot.should_run = False
+            self.bot.stop()
             if self.bot_thread and self.bot_thread.is_alive():
                 self.log_message("Stopping bot... This may take a moment.")
             self.start_button.config(state=tk.NORMAL)
@@ -102,10 +163,17 @@ class TradingApp:
     def exit_app(self):
         if self.is_running:
             self.stop_bot()
+        self.closed = True
         self.window.destroy()
 
     def run(self):
         self.window.mainloop()
+        
+        # The window is closed, so the bot thread no longer calls into Tk;
+        # let it finish its pass, then send whatever it queued
+        if self.bot_thread and self.bot_thread.is_alive():
+            self.bot_thread.join(timeout=30)
+        self.bot.notification_service.close()
 
 @dataclass
 class ORBSLevel:
@@ -123,56 +191,255 @@ class NotificationService:
         self.discord_role_id = discord_role_id
         self.log_callback = log_callback or (lambda msg: None) # Default to a no-op function
 
+        # Set while an event loop is attached; webhooks are then posted on it
+        # without blocking the caller
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._http_session: Optional[aiohttp.ClientSession] = None
+        # In-flight webhook futures; added on the caller's thread and
+        # discarded on the loop's, so both go through _pending_lock
+        self._pending = set()
+        self._pending_lock = threading.Lock()
+
+        # Blocking webhook posts share one pooled session, retrying briefly on
+        # rate limits and gateway errors. A read timeout or broken response may
+        # come after Discord accepted the post, so those are never retried
+        self._http = requests.Session()
+        self._http.mount('https://', HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=4,
+            max_retries=Retry(
+                total=2,
+                read=0,
+                other=0,
+                backoff_factor=0.3,
+                status_forcelist=[429, 502, 503, 504],
+                allowed_methods=None
+            )
+        ))
+
+        # One SMTP connection is reused across emails; sends are serialized
+        # because smtplib connections are not thread-safe
+        self._smtp: Optional[smtplib.SMTP] = None
+        self._smtp_last_used = 0.0
+        self._smtp_lock = threading.Lock()
+        self.SMTP_MAX_IDLE_SECONDS = 60
+
+        # Emails, and webhooks while no event loop is attached, are sent by a
+        # worker thread so notify() returns without waiting on the network
+        self._outbox: queue.Queue = queue.Queue()
+        self._worker = threading.Thread(target=self._send_worker, daemon=True)
+        self._worker.start()
+        # Set by close() once the worker has been told to stop; later sends
+        # are made on the caller's thread instead of being queued
+        self._closed = False
+        self._outbox_lock = threading.Lock()
+
+        # Queued sends still go out, and SMTP quits under its lock, on exit
+        atexit.register(self.close)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        """Sends what is still queued, then closes the webhook session and the SMTP connection."""
+        with self._outbox_lock:
+            if not self._closed:
+                self._closed = True
+                self._outbox.put(None)
+        self._worker.join()
+        self._http.close()
+        with self._smtp_lock:
+            self._close_smtp()
+
     def set_logging_callback(self, callback: Callable):
         self.log_callback = callback
+
+    def _send_worker(self):
+        """Runs queued sends in order until close() queues None."""
+        while True:
+            job = self._outbox.get()
+            try:
+                if job is None:
+                    return
+                send, args = job
+                send(*args)
+            finally:
+                self._outbox.task_done()
+
+    def _enqueue(self, send: Callable, *args):
+        """Queues a send for the worker, or runs it here once the service is closed."""
+        with self._outbox_lock:
+            if not self._closed:
+                self._outbox.put((send, args))
+                return
+        
+        self.log_callback("Warning: notification sent after the notifier was closed; sending it directly")
+        send(*args)
+
+    def flush(self):
+        """Blocks until every queued email and webhook has been sent."""
+        self._outbox.join()
+
+    async def start_async(self):
+        """Attaches the running event loop and opens the shared webhook session."""
+        self._loop = asyncio.get_running_loop()
+        self._http_session = aiohttp.ClientSession()
+
+    async def close_async(self):
+        """Waits for in-flight webhooks, then closes the webhook session."""
+        with self._pending_lock:
+            pending = list(self._pending)
+        if pending:
+            await asyncio.gather(*(asyncio.wrap_future(f) for f in pending), return_exceptions=True)
+        
+        self._loop = None
+        if self._http_session:
+            await self._http_session.close()
+            self._http_session = None
+    
+    def _get_smtp(self) -> smtplib.SMTP:
+        """Returns a live SMTP connection, reconnecting if it is stale or dropped."""
+        if self._smtp is not None and time.monotonic() - self._smtp_last_used < self.SMTP_MAX_IDLE_SECONDS:
+            try:
+                if self._smtp.noop()[0] == 250:
+                    return self._smtp
+            except (smtplib.SMTPException, OSError):
+                pass
+        
+        self._close_smtp()
+        server = smtplib.SMTP(self.email_config['smtp_server'], self.email_config['smtp_port'])
+        server.starttls()
+        server.login(self.email_config['from_email'], self.email_config['password'])
+        self._smtp = server
+        self._smtp_last_used = time.monotonic()
+        return server
+    
+    def _close_smtp(self):
+        if self._smtp is None:
+            return
+        
+        try:
+            self._smtp.quit()
+        except (smtplib.SMTPException, OSError):
+            pass
+        finally:
+            self._smtp = None
     
     def send_email(self, subject: str, body: str):
         if not self.email_config:
             return
         
         try:
-            msg = MIMEMultipart()
+            # A lone text part; the multipart wrapper only ever held this one part
+            msg = MIMEText(body, 'plain')
             msg['From'] = self.email_config['from_email']
             msg['To'] = self.email_config['to_email']
             msg['Subject'] = subject
-            msg.attach(MIMEText(body, 'plain'))
             
-            server = smtplib.SMTP(self.email_config['smtp_server'], self.email_config['smtp_port'])
-            server.starttls()
-            server.login(self.email_config['from_email'], self.email_config['password'])
-            server.send_message(msg)
-            server.quit()
+            with self._smtp_lock:
+                try:
+                    self._get_smtp().send_message(msg)
+                except smtplib.SMTPServerDisconnected:
+                    # The server closed an idle connection; reconnect once
+                    self._smtp = None
+                    self._get_smtp().send_message(msg)
+                self._smtp_last_used = time.monotonic()
             
             self.log_callback(f"Email sent: {subject}")
         except Exception as e:
             self.log_callback(f"Failed to send email: {e}")
             
+    @staticmethod
+    def _discord_payload(message: str, ping_role: Optional[str] = None) -> bytes:
+        """Encodes the webhook body once, shared by the blocking and async senders."""
+        if ping_role:
+            message = f"<@&{ping_role}> {message}"
+        
+        return json.dumps({"content": message}, ensure_ascii=False).encode()
+            
     def send_discord_notification(self, message: str, ping_role: Optional[str] = None):
         if not self.discord_webhook:
             return
         
         try:
-            if ping_role:
-                message = f"<@&{ping_role}> {message}"
-                
-            data = {"content": message}
-            response = requests.post(self.discord_webhook, json=data)
+            payload = self._discord_payload(message, ping_role)
+            response = self._http.post(self.discord_webhook, data=payload, headers=JSON_HEADERS, timeout=5)
             if response.status_code == 204:
                 self.log_callback("Discord notification sent")
             else:
                 self.log_callback(f"Discord notification failed: {response.status_code}")
         except Exception as e:
             self.log_callback(f"Failed to send Discord notification: {e}")
+
+    async def send_discord_async(self, message: str, ping_role: Optional[str] = None):
+        if not self.discord_webhook:
+            return
+        
+        try:
+            payload = self._discord_payload(message, ping_role)
+            async with self._http_session.post(self.discord_webhook, data=payload, headers=JSON_HEADERS) as response:
+                if response.status == 204:
+                    self.log_callback("Discord notification sent")
+                else:
+                    self.log_callback(f"Discord notification failed: {response.status}")
+        except Exception as e:
+            self.log_callback(f"Failed to send Discord notification: {e}")
+            
+    def _discard_pending(self, future):
+        with self._pending_lock:
+            self._pending.discard(future)
+            
+    def _dispatch_discord(self, message: str):
+        """Posts on the attached event loop if there is one, otherwise blocks."""
+        if self._loop is not None:
+            future = asyncio.run_coroutine_threadsafe(
+                self.send_discord_async(message, self.discord_role_id), self._loop
+            )
+            with self._pending_lock:
+                self._pending.add(future)
+            future.add_done_callback(self._discard_pending)
+        else:
+            self._enqueue(self.send_discord_notification, message, self.discord_role_id)
             
     def notify(self, title: str, message:str):
         gui_message = f"\n📈 {title}\n📊 {message}\n{'-' * 50}"
         self.log_callback(gui_message)
         
         if self.email_config:
-            self.send_email(title, message)
+            self._enqueue(self.send_email, title, message)
             
         if self.discord_webhook:
-            self.send_discord_notification(f"**{title}**\n{message}", self.discord_role_id)
+            self._dispatch_discord(f"**{title}**\n{message}")
+
+    def notify_batch(self, notifications: List[Tuple[str, str]]):
+        """Sends several (title, message) notifications as one email and as few webhook posts as fit."""
+        if len(notifications) <= 1:
+            for title, message in notifications:
+                self.notify(title, message)
+            return
+        
+        for title, message in notifications:
+            self.log_callback(f"\n📈 {title}\n📊 {message}\n{'-' * 50}")
+        
+        if self.email_config:
+            body = "\n---\n".join(f"{title}\n{message}" for title, message in notifications)
+            self._enqueue(self.send_email, f"🚨 {len(notifications)} ORBS Signals", body)
+        
+        if self.discord_webhook:
+            # Pack whole notifications into posts under Discord's length limit,
+            # leaving room for the role mention
+            limit = DISCORD_MESSAGE_LIMIT - (len(f"<@&{self.discord_role_id}> ") if self.discord_role_id else 0)
+            batch = ""
+            for title, message in notifications:
+                part = f"**{title}**\n{message}"
+                if batch and len(batch) + len("\n---\n") + len(part) > limit:
+                    self._dispatch_discord(batch)
+                    batch = ""
+                batch = f"{batch}\n---\n{part}" if batch else part
+            self._dispatch_discord(batch)
 
 class ORBSTradingBot:
     def __init__(
@@ -191,7 +458,13 @@ class ORBSTradingBot:
         self.set_logging_callback(log_callback)
         
         self.orbs_levels = {}
-        self.active_signals = set()
+        # Signal ids pack symbol index, timeframe length and epoch minute into one int
+        self.active_signals: Set[int] = set()
+        self._symbol_index = {symbol: i for i, symbol in enumerate(symbols)}
+        # ORB highs and lows by symbol index, so the breakout scan gathers
+        # them with one fancy-index; NaN until a symbol's ORB is known
+        self._orb_high = np.full(len(symbols), np.nan)
+        self._orb_low = np.full(len(symbols), np.nan)
         self.market_open_hours = 9
         self.market_open_minute = 30
         self.market_close_hour = 16
@@ -203,57 +476,320 @@ class ORBSTradingBot:
         self.market_open_notified_today = False
 
         self.should_run = False
+
+        # The running run_async's loop and wake event, held as one tuple so
+        # another thread reads a matching pair; stop() sets the event so a
+        # sleep that would last until the next session event ends at once
+        self._wakeup: Optional[Tuple[asyncio.AbstractEventLoop, asyncio.Event]] = None
+
+        # Yahoo fetches are network-bound, so each timeframe's batch download
+        # runs concurrently
+        self._pool = ThreadPoolExecutor(max_workers=max(1, len(execution_timeframes)))
+
+        # Recent bar frames keyed by (symbol, period, interval), so the
+        # breakout scan and the price lookups share one fetch
+        self._price_cache: Dict[Tuple[str, str, str], Tuple[float, pd.DataFrame]] = {}
+
+        # Ticker objects keep their exchange timezone and metadata lookups, so
+        # one per symbol is reused for the life of the bot
+        self._tickers: Dict[str, yf.Ticker] = {}
+
+        # The opening range is fixed once its window closes, so each symbol's
+        # ORB is computed once per trading day
+        self._orb_cache: Dict[Tuple[str, date], ORBSLevel] = {}
+
+        # Today's intraday bars keyed by (symbol, interval), extended in place
+        # of refetching the whole day
+        self._bars: Dict[Tuple[str, str], pd.DataFrame] = {}
+
+        # The same bars are pickled to disk, so a restart mid-session only
+        # fetches what it missed
+        self._cache_dir = Path(os.getenv("ORBS_CACHE_DIR", ".orb_cache"))
+        self.prune_bar_cache(datetime.now(EASTERN_TZ).date())
+
+        # Scans run just after bar closes; Yahoo gets a short slip to publish
+        # the closed bar, and each timeframe is scanned once per closed bar
+        self.BAR_CLOSE_SLIP_SECONDS = 2
+        self._last_scanned_bar: Dict[str, int] = {}
+
+        # A timeframe only counts as scanned once each symbol's frame has
+        # moved past the closed bar; until then the scan is retried shortly,
+        # for at most BAR_RETRY_WINDOW_SECONDS after the close
+        self.BAR_RETRY_SECONDS = 3
+        self.BAR_RETRY_WINDOW_SECONDS = 30
+        self._scan_retry_at: Optional[float] = None
+
+        # Today's session boundaries, rebuilt when the Eastern date changes
+        self._session_date: Optional[date] = None
+        self._session_open_dt: Optional[datetime] = None
+        self._session_open_ts: Optional[float] = None
+        self._pre_market_dt: Optional[datetime] = None
+        self._session_open_t: Optional[dt_time] = None
+        self._session_close_t: Optional[dt_time] = None
+        self._orb_end_dt: Optional[datetime] = None
         
     def set_logging_callback(self, callback: Optional[Callable]):
         """Sets the function to call for logging messages."""
         self.log_callback = callback or (lambda msg: None)
 
-    def is_market_hours(self) -> bool:
-        """Checks if the current time is within regular market hours."""
-        now = datetime.now()
-        current_time = now.time()
+    @staticmethod
+    def timeframe_seconds(timeframe: str) -> int:
+        """Converts a yfinance interval such as '5m' or '1h' to seconds."""
+        units = {'m': 60, 'h': 3600, 'd': 86400}
+        return int(timeframe[:-1]) * units[timeframe[-1]]
+
+    def closed_bar_number(self, timeframe: str, timestamp: float) -> int:
+        """Numbers the latest closed bar of a timeframe, counting from that day's open.
+
+        Yahoo starts intraday bars at the open, so 1h and 90m bars only line
+        up with Yahoo's when counted from there rather than from the epoch.
+        """
+        self._ensure_session_times(datetime.fromtimestamp(timestamp, EASTERN_TZ))
+        return int((timestamp - self.BAR_CLOSE_SLIP_SECONDS - self._session_open_ts) // self.timeframe_seconds(timeframe))
+
+    def bar_start(self, timeframe: str, bar_number: int) -> float:
+        """Epoch seconds at which a bar numbered by closed_bar_number starts."""
+        return self._session_open_ts + bar_number * self.timeframe_seconds(timeframe)
+
+    def seconds_until_next_bar(self) -> float:
+        """Seconds until the next bar close on any execution timeframe, or a pending scan retry."""
+        now = time.time()
+        wait = min(
+            self.bar_start(timeframe, self.closed_bar_number(timeframe, now) + 1)
+            + self.BAR_CLOSE_SLIP_SECONDS - now
+            for timeframe in self.execution_timeframes
+        )
+        if self._scan_retry_at is not None:
+            wait = min(wait, self._scan_retry_at - now)
+        return wait
+
+    def seconds_until_next_session_event(self, now: datetime) -> float:
+        """Seconds until the pre-market alert, the open or midnight's daily reset, whichever is next."""
+        self._ensure_session_times(now)
         
-        if now.weekday() >= 5: 
-            return False
+        events = []
+        if now.weekday() < 5:
+            events = [self._pre_market_dt, self._session_open_dt]
+        events.append(datetime.combine(now.date() + timedelta(days=1), dt_time(0), tzinfo=EASTERN_TZ))
+        
+        # Compare as epoch seconds; wall-clock subtraction is off across DST changes
+        next_event = next(event for event in events if event > now)
+        return next_event.timestamp() - now.timestamp()
+
+    def _ensure_session_times(self, now: datetime):
+        """Computes today's open, close and ORB end once per Eastern date."""
+        if now.date() == self._session_date:
+            return
         
         market_open = now.replace(
             hour=self.market_open_hours, 
             minute=self.market_open_minute, 
             second=0, 
             microsecond=0
-        ).time()
+        )
         
-        market_close = now.replace(
-            hour=self.market_close_hour, 
-            minute=0, 
-            second=0, 
-            microsecond=0
-        ).time()
+        self._session_open_dt = market_open
+        self._session_open_ts = market_open.timestamp()
+        self._pre_market_dt = market_open - timedelta(minutes=30)
+        self._session_open_t = market_open.time()
+        self._session_close_t = dt_time(self.market_close_hour, 0)
+        self._orb_end_dt = market_open + timedelta(minutes=self.orb_minutes)
+        self._session_date = now.date()
+
+    def is_market_hours(self, now: Optional[datetime] = None) -> bool:
+        """Checks if the current time is within regular market hours."""
+        now = now or datetime.now(EASTERN_TZ)
+        
+        if now.weekday() >= 5: 
+            return False
         
-        return market_open <= current_time <= market_close
+        self._ensure_session_times(now)
+        
+        return self._session_open_t <= now.time() <= self._session_close_t
+    
+    @staticmethod
+    def price_cache_ttl(interval: str) -> int:
+        """Seconds a fetched frame stays fresh; 1m bars change fastest."""
+        return 20 if interval == '1m' else 60
+    
+    def get_cached_data(self, symbol: str, period: str, interval: str) -> Optional[pd.DataFrame]:
+        hit = self._price_cache.get((symbol, period, interval))
+        if hit and time.monotonic() - hit[0] < self.price_cache_ttl(interval):
+            return hit[1]
+        return None
+    
+    def cache_data(self, symbol: str, period: str, interval: str, data: pd.DataFrame):
+        self._price_cache[(symbol, period, interval)] = (time.monotonic(), data)
+    
+    def _ticker(self, symbol: str) -> yf.Ticker:
+        ticker = self._tickers.get(symbol)
+        if ticker is None:
+            ticker = self._tickers[symbol] = yf.Ticker(symbol)
+        return ticker
     
     def get_stock_data(self, symbol: str, period: str = '1d', interval: str = "1m") -> pd.DataFrame:
+        cached = self.get_cached_data(symbol, period, interval)
+        if cached is not None:
+            return cached
+        
         try:
-            ticker = yf.Ticker(symbol)
+            ticker = self._ticker(symbol)
             data = ticker.history(period=period, interval=interval)
             
             if data.empty:
                 self.log_callback(f"No data received for {symbol}")
                 return pd.DataFrame()
             
-            if isinstance(data.index, pd.DatetimeIndex):
-                if data.index.tz is None:
-                    data.index = data.index.tz_localize("US/Eastern")
-                else:
-                    data.index = data.index.tz_convert("US/Eastern")
-                
+            data = self.to_eastern(data)
+            self.cache_data(symbol, period, interval, data)
             return data
         except Exception as e:
             self.log_callback(f"Error fetching data for {symbol}: {e}")
             return pd.DataFrame()
+    
+    def get_stock_data_multi(self, symbols: List[str], period: str = '1d', interval: str = "1m") -> Dict[str, pd.DataFrame]:
+        """Fetches bars for several symbols with one batched Yahoo download."""
+        frames = {symbol: pd.DataFrame() for symbol in symbols}
+        
+        missing = []
+        for symbol in symbols:
+            cached = self.get_cached_data(symbol, period, interval)
+            if cached is not None:
+                frames[symbol] = cached
+            else:
+                missing.append(symbol)
+        
+        if not missing:
+            return frames
+        
+        # Today's intraday bars stay resident, so later fetches only ask Yahoo
+        # for the last (still forming) bar onwards
+        resident = {}
+        if period == '1d':
+            today = datetime.now(EASTERN_TZ).date()
+            for symbol in missing:
+                bars = self._bars.get((symbol, interval))
+                if bars is None:
+                    bars = self.load_bars(symbol, interval, today)
+                if bars is not None and bars.index[-1].date() == today:
+                    resident[symbol] = bars
         
-    def calculate_orbs_levels(self, symbol: str) -> Optional[ORBSLevel]:
-        data = self.get_stock_data(symbol, period='1d', interval='1m')
+        fetched = {}
+        full = [symbol for symbol in missing if symbol not in resident]
+        if full:
+            fetched.update(self._download(full, interval, period=period))
+        
+        if resident:
+            start = min(bars.index[-1] for bars in resident.values())
+            new_bars = self._download(list(resident), interval, start=start)
+            for symbol, bars in resident.items():
+                if symbol in new_bars:
+                    combined = pd.concat([bars, new_bars[symbol]])
+                    bars = combined[~combined.index.duplicated(keep='last')]
+                fetched[symbol] = bars
+        
+        for symbol in missing:
+            data_symbol = fetched.get(symbol)
+            
+            if data_symbol is None:
+                self.log_callback(f"No data received for {symbol}")
+                continue
+            
+            frames[symbol] = data_symbol
+            self.cache_data(symbol, period, interval, data_symbol)
+            if period == '1d':
+                self._bars[(symbol, interval)] = data_symbol
+                self.store_bars(symbol, interval, data_symbol)
+        
+        return frames
+    
+    def _bars_path(self, symbol: str, interval: str, day: date) -> Path:
+        return self._cache_dir / f"{symbol}_{interval}_{day.isoformat()}.pkl"
+    
+    def load_bars(self, symbol: str, interval: str, day: date) -> Optional[pd.DataFrame]:
+        """Reads a day's intraday bars saved by an earlier run, if any."""
+        try:
+            return pd.read_pickle(self._bars_path(symbol, interval, day))
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            self.log_callback(f"Error reading cached bars for {symbol}: {e}")
+            return None
+    
+    def store_bars(self, symbol: str, interval: str, bars: pd.DataFrame):
+        """Saves intraday bars under the date of their last bar."""
+        try:
+            self._cache_dir.mkdir(exist_ok=True)
+            bars.to_pickle(self._bars_path(symbol, interval, bars.index[-1].date()))
+        except OSError as e:
+            self.log_callback(f"Error caching bars for {symbol}: {e}")
+    
+    def prune_bar_cache(self, today: date):
+        """Deletes bar files this bot wrote on days other than `today`."""
+        try:
+            for path in self._cache_dir.glob("*.pkl"):
+                match = BAR_CACHE_FILE_PATTERN.fullmatch(path.name)
+                if match and match.group(1) != today.isoformat():
+                    path.unlink(missing_ok=True)
+        except OSError as e:
+            self.log_callback(f"Error pruning cached bars: {e}")
+    
+    def _download(self, symbols: List[str], interval: str, **range_kwargs) -> Dict[str, pd.DataFrame]:
+        """Runs one grouped yf.download; symbols with no rows are left out."""
+        try:
+            data = yf.download(
+                tickers=" ".join(symbols),
+                interval=interval,
+                group_by='ticker',
+                progress=False,
+                threads=True,
+                auto_adjust=True,
+                **range_kwargs
+            )
+        except Exception as e:
+            self.log_callback(f"Error fetching data for {', '.join(symbols)}: {e}")
+            return {}
+        
+        downloaded = set(data.columns.get_level_values(0)) if isinstance(data.columns, pd.MultiIndex) else set()
+        
+        # Every symbol's slice shares this index, so convert it once here
+        data = self.to_eastern(data)
+        
+        frames = {}
+        for symbol in symbols:
+            if symbol not in downloaded:
+                continue
+            
+            # Symbols share one index, so drop the rows another symbol filled
+            data_symbol = data[symbol].dropna(how='all')
+            if not data_symbol.empty:
+                frames[symbol] = data_symbol
+        
+        return frames
+    
+    @staticmethod
+    def to_eastern(data: pd.DataFrame) -> pd.DataFrame:
+        """Puts a bar frame's index on US/Eastern time."""
+        if isinstance(data.index, pd.DatetimeIndex):
+            # Yahoo already stamps US listings in New York time
+            if data.index.tz == EASTERN_TZ:
+                return data
+            
+            if data.index.tz is None:
+                data.index = data.index.tz_localize(EASTERN_TZ)
+            else:
+                data.index = data.index.tz_convert(EASTERN_TZ)
+        
+        return data
+        
+    def calculate_orbs_levels(self, symbol: str, data: Optional[pd.DataFrame] = None, now: Optional[datetime] = None) -> Optional[ORBSLevel]:
+        now = now or datetime.now(EASTERN_TZ)
+        cache_key = (symbol, now.date())
+        if cache_key in self._orb_cache:
+            return self._orb_cache[cache_key]
+        
+        if data is None:
+            data = self.get_stock_data(symbol, period='1d', interval='1m')
         
         if data.empty:
             return None
@@ -264,29 +800,29 @@ class ORBSTradingBot:
             self.log_callback(f"Invalid index type or timezone for {symbol}. Cannot calculate ORBS levels.")
             return None
         
-        now = datetime.now().replace(tzinfo=data_index.tz)
-        
-        market_open_today = now.replace(
-            hour=self.market_open_hours, 
-            minute=self.market_open_minute, 
-            second=0,
-            microsecond=0
-        )
+        self._ensure_session_times(now)
+        market_open_today = self._session_open_dt
+        orb_end_time = self._orb_end_dt
         
-        orb_end_time = market_open_today + timedelta(minutes=self.orb_minutes)
+        if not data_index.is_monotonic_increasing:
+            data = data.sort_index()
+            data_index = data.index
         
-        orb_data = data[(data.index >= market_open_today) & (data.index <= orb_end_time)]
+        # Binary-search the window bounds and reduce the raw column slices,
+        # without building masks or an intermediate frame
+        start = data_index.searchsorted(market_open_today, side='left')
+        end = data_index.searchsorted(orb_end_time, side='right')
         
-        if orb_data.empty:
+        if start >= end:
             self.log_callback(f"No data available for ORB period for {symbol}")
             return None
 
-        if 'High' not in orb_data.columns or 'Low' not in orb_data.columns:
+        if 'High' not in data.columns or 'Low' not in data.columns:
             self.log_callback(f"Missing required columns in ORB data for {symbol}")
             return None
         
-        orb_high = orb_data['High'].max()
-        orb_low = orb_data['Low'].min()
+        orb_high = float(data['High'].to_numpy()[start:end].max())
+        orb_low = float(data['Low'].to_numpy()[start:end].min())
         orb_width = orb_high - orb_low
         
         orbs_level = ORBSLevel(
@@ -300,105 +836,111 @@ class ORBSTradingBot:
         
         self.log_callback(f"ORBS levels calculated for {symbol}: High={orb_high:.2f}, Low={orb_low:.2f}, Width={orb_width:.2f}")
         
+        if now >= orb_end_time:
+            self._orb_cache[cache_key] = orbs_level
+        
         return orbs_level
     
-    def check_breakout(self, symbol: str, timeframe: str) -> Optional[str]:
-        """Checks if a breakout has occurred for a given symbol and timeframe."""
+    def check_breakout(self, symbol: str, timeframe: str, data: Optional[pd.DataFrame] = None) -> Optional[Tuple[str, float]]:
+        """Checks if a breakout has occurred for a given symbol and timeframe.
+
+        Returns the breakout type with the latest close from the same bars.
+        """
         if symbol not in self.orbs_levels:
             self.log_callback(f"No ORBS levels found for {symbol}")
             return None
         
-        orbs = self.orbs_levels[symbol]
-        
-        data = self.get_stock_data(symbol, period='1d', interval=timeframe)
+        if data is None:
+            data = self.get_stock_data(symbol, period='1d', interval=timeframe)
         
         if data.empty or len(data) < 2:
             return None
         
-        latest_candle = data.iloc[-2]
-        current_candle = data.iloc[-1]
-
-        if isinstance(data.index, pd.DatetimeIndex) and len(data.index) > 0:
-            current_time = data.index[-1]
-
-            if isinstance(current_time, pd.Timestamp):
-                current_time = current_time.to_pydatetime()
-        else:
+        if not isinstance(data.index, pd.DatetimeIndex):
             self.log_callback(f"Invalid timestamp data for {symbol}")
             return None
         
-        if current_time <= orbs.orb_end_time:
-            return None
+        return self.find_breakouts(timeframe, {symbol: data}).get(symbol)
+    
+    def signal_id(self, symbol: str, timeframe: str, epoch_minute: int) -> int:
+        """Packs a bar's signal key into one int: symbol | timeframe seconds | epoch minute."""
+        return (self._symbol_index[symbol] << 48) | (self.timeframe_seconds(timeframe) << 30) | epoch_minute
+    
+    def find_breakouts(self, timeframe: str, frames: Dict[str, pd.DataFrame]) -> Dict[str, Tuple[str, float]]:
+        """Checks every symbol's bars for a breakout with one array comparison.
 
-        signal_id = f"{symbol}_{timeframe}_{current_time.strftime('%H%M')}"
+        Returns {symbol: (breakout type, latest close)} for the symbols that broke out.
+        """
+        candidates = []
+        indices = []
         
-        if signal_id in self.active_signals:
-            return None
+        for symbol, data in frames.items():
+            if symbol not in self.orbs_levels or len(data) < 2 or not isinstance(data.index, pd.DatetimeIndex):
+                continue
+            
+            current_time = data.index[-1]
+            if current_time <= self.orbs_levels[symbol].orb_end_time:
+                continue
+            
+            # Timestamp.value is epoch nanoseconds; one signal per minute bar
+            signal_id = self.signal_id(symbol, timeframe, current_time.value // 60_000_000_000)
+            if signal_id in self.active_signals:
+                continue
+            
+            candidates.append((symbol, signal_id, data['Close'].to_numpy()))
+            indices.append(self._symbol_index[symbol])
         
-        breakout_type = None
-
-        if latest_candle['Close'] > orbs.orb_high:
-            breakout_type = "BULLISH"
-            self.active_signals.add(signal_id)
-
-        elif latest_candle['Close'] < orbs.orb_low:
-            breakout_type = "BEARISH"
+        if not candidates:
+            return {}
+        
+        # Compare each symbol's last completed close against its ORB
+        latest_closes = np.array([close[-2] for _, _, close in candidates])
+        orb_highs = self._orb_high[indices]
+        orb_lows = self._orb_low[indices]
+        
+        bullish = latest_closes > orb_highs
+        breakout_types = np.where(bullish, "BULLISH", "BEARISH")
+        
+        breakouts = {}
+        for i in np.flatnonzero(bullish | (latest_closes < orb_lows)):
+            symbol, signal_id, close = candidates[i]
             self.active_signals.add(signal_id)
+            breakouts[symbol] = (str(breakout_types[i]), float(close[-1]))
         
-        return breakout_type
+        return breakouts
     
-    def generate_trade_signal(self, symbol: str, breakout_type: str, timeframe: str):
-        """Generates a detailed trade signal and sends a notification."""
+    def generate_trade_signal(self, symbol: str, breakout_type: str, timeframe: str, current_price: Optional[float] = None, send: bool = True, now: Optional[datetime] = None):
+        """Generates a detailed trade signal and, unless `send` is False, sends a notification."""
+        now = now or datetime.now(EASTERN_TZ)
         orbs = self.orbs_levels[symbol]
-        current_price = self.get_current_price(symbol)
+        if current_price is None:
+            current_price = self.get_current_price(symbol)
         
         if current_price is None:
             return None
         
-        signal_type = "UNKNOWN"
-        direction = "❓UNKNOWN"
-        entry_reason = "Unknown breakout type"
-        
-        if breakout_type == "BULLISH":
-            signal_type = "CALL"
-            direction = "🟢 LONG"
-            entry_reason = f"Price broke above ORB high (${orbs.orb_high:.2f})"
-            
-        elif breakout_type == "BEARISH":
-            signal_type = "PUT"
-            direction = "🔴 SHORT"
-            entry_reason = f"Price broke below ORB low (${orbs.orb_low:.2f})"
-
-        orb_start_str = orbs.orb_start_time.strftime('%H:%M') if orbs.orb_start_time else "N/A"
-        orb_end_str = orbs.orb_end_time.strftime('%H:%M') if orbs.orb_end_time else "N/A"
+        signal_type, direction, entry_reason = SIGNAL_STYLES.get(breakout_type, UNKNOWN_SIGNAL_STYLE)
         
-        message = f"""
-🎯 ORBS BREAKOUT SIGNAL
-━━━━━━━━━━━━━━━━━━━━
-📈 Symbol: {symbol}
-🎨 Signal: {signal_type} Options
-📊 Direction: {direction}
-⏰ Timeframe: {timeframe}
-💰 Current Price: ${current_price:.2f}
-
-📋 ORB Details:
-• ORB High: ${orbs.orb_high:.2f}
-• ORB Low: ${orbs.orb_low:.2f}
-• ORB Width: ${orbs.orb_width:.2f}
-• ORB Period: {orb_start_str} - {orb_end_str}
-
-🔍 Entry Reason:
-{entry_reason}
-
-🎯 Suggested Action:
-Buy {signal_type} options on Robinhood
-
-⏱️ Signal Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-"""
+        fields = {
+            'symbol': symbol,
+            'signal_type': signal_type,
+            'direction': direction,
+            'timeframe': timeframe,
+            'current_price': current_price,
+            'orb_high': orbs.orb_high,
+            'orb_low': orbs.orb_low,
+            'orb_width': orbs.orb_width,
+            'orb_start': orbs.orb_start_time.strftime('%H:%M') if orbs.orb_start_time else "N/A",
+            'orb_end': orbs.orb_end_time.strftime('%H:%M') if orbs.orb_end_time else "N/A",
+            'signal_time': now,
+        }
+        fields['entry_reason'] = entry_reason.format_map(fields)
         
-        title = f"🚨 {symbol} {signal_type} SIGNAL - ORBS Breakout"
+        title = SIGNAL_TITLE_TEMPLATE.format_map(fields)
+        message = SIGNAL_MESSAGE_TEMPLATE.format_map(fields)
         
-        self.notification_service.notify(title, message.strip())
+        if send:
+            self.notification_service.notify(title, message)
         
         return {
             'symbol': symbol,
@@ -408,67 +950,173 @@ Buy {signal_type} options on Robinhood
             'orb_high': orbs.orb_high,
             'orb_low': orbs.orb_low,
             'timeframe': timeframe,
-            'timestamp': datetime.now()
+            'timestamp': now,
+            'title': title,
+            'message': message
         }
     
     def get_current_price(self, symbol: str) -> Optional[float]:
         """Gets the current price of a stock."""
         try:
-            ticker = yf.Ticker(symbol)
-            data = ticker.history(period='1d', interval='1m')
+            data = self.get_stock_data(symbol, period='1d', interval='1m')
             if not data.empty:
-                return float(data['Close'].iloc[-1])
+                return float(data['Close'].to_numpy()[-1])
         except Exception as e:
             self.log_callback(f"Error getting current price for {symbol}: {e}")
         return None
     
-    def update_orbs_levels(self):
+    def get_current_prices(self, symbols: List[str]) -> Dict[str, Optional[float]]:
+        """Gets current prices for several stocks from one batched fetch."""
+        frames = self.get_stock_data_multi(symbols, period='1d', interval='1m')
+        return {
+            symbol: float(data['Close'].to_numpy()[-1]) if not data.empty else None
+            for symbol, data in frames.items()
+        }
+    
+    def update_orbs_levels(self, now: Optional[datetime] = None):
         """Calculates ORBS levels for all tracked symbols."""
+        now = now or datetime.now(EASTERN_TZ)
+        pending = [symbol for symbol in self.symbols if (symbol, now.date()) not in self._orb_cache]
+        frames = self.get_stock_data_multi(pending, period='1d', interval='1m') if pending else {}
+        
         for symbol in self.symbols:
-            orbs_level = self.calculate_orbs_levels(symbol)
+            orbs_level = self.calculate_orbs_levels(symbol, frames.get(symbol), now)
             if orbs_level:
                 self.orbs_levels[symbol] = orbs_level
+                self._orb_high[self._symbol_index[symbol]] = orbs_level.orb_high
+                self._orb_low[self._symbol_index[symbol]] = orbs_level.orb_low
     
-    def scan_orbs_levels(self):
+    def scan_orbs_levels(self, now: Optional[datetime] = None):
         """Scans for breakout signals on all symbols and timeframes."""
         signals = []
+        now = now or datetime.now(EASTERN_TZ)
         
-        for symbol in self.symbols:
-            if symbol not in self.orbs_levels:
-                continue
+        symbols = [symbol for symbol in self.symbols if symbol in self.orbs_levels]
+        if not symbols:
+            return signals
+        
+        self._scan_retry_at = None
+        
+        # Only timeframes with a bar closed since their last scan have new data
+        timestamp = now.timestamp()
+        closed_bars = {timeframe: self.closed_bar_number(timeframe, timestamp) for timeframe in self.execution_timeframes}
+        timeframes = [
+            timeframe for timeframe in self.execution_timeframes
+            if self._last_scanned_bar.get(timeframe) != closed_bars[timeframe]
+        ]
+        if not timeframes:
+            return signals
+        
+        # One batched download per timeframe, all in flight at once
+        futures = {
+            timeframe: self._pool.submit(self.get_stock_data_multi, symbols, '1d', timeframe)
+            for timeframe in timeframes
+        }
+        
+        breakouts = {}
+        for timeframe, future in futures.items():
+            frames = future.result()
+            
+            # closed_bar_number counts closed bars, so it is also the number of
+            # the bar now forming; it must be in the frame, otherwise close[-2]
+            # is still the bar before the close
+            next_bar_start = self.bar_start(timeframe, closed_bars[timeframe])
+            fresh = {
+                symbol: data for symbol, data in frames.items()
+                if not data.empty and data.index[-1].value // 1_000_000_000 >= next_bar_start
+            }
+            
+            if len(fresh) < len(frames) and timestamp - next_bar_start < self.BAR_RETRY_WINDOW_SECONDS:
+                # Yahoo has not published the bar yet; refetch the late
+                # symbols past the TTL cache and leave the timeframe due
+                for symbol in frames.keys() - fresh.keys():
+                    self._price_cache.pop((symbol, '1d', timeframe), None)
+                self._scan_retry_at = time.time() + self.BAR_RETRY_SECONDS
+                frames = fresh
+            else:
+                self._last_scanned_bar[timeframe] = closed_bars[timeframe]
             
-            for timeframe in self.execution_timeframes:
-                breakout_type = self.check_breakout(symbol, timeframe)
+            breakouts[timeframe] = self.find_breakouts(timeframe, frames)
+        
+        # Signals are generated on this thread, in symbol/timeframe order, and
+        # sent together once the scan is complete
+        for symbol in symbols:
+            for timeframe in timeframes:
+                breakout = breakouts[timeframe].get(symbol)
                 
-                if breakout_type:
-                    signal = self.generate_trade_signal(symbol, breakout_type, timeframe)
+                if breakout:
+                    breakout_type, current_price = breakout
+                    signal = self.generate_trade_signal(symbol, breakout_type, timeframe, current_price, send=False, now=now)
                     if signal:  
                         signals.append(signal)
-
-                    time.sleep(1)
+        
+        self.notification_service.notify_batch([(signal['title'], signal['message']) for signal in signals])
                     
         return signals
     
     def reset_daily_data(self):
         """Resets the bot's state at the start of a new day."""
         self.orbs_levels.clear()
+        self._orb_high.fill(np.nan)
+        self._orb_low.fill(np.nan)
         self.active_signals.clear()
+        self._price_cache.clear()
+        self._orb_cache.clear()
+        self._bars.clear()
+        self.prune_bar_cache(datetime.now(EASTERN_TZ).date())
+        self._last_scanned_bar.clear()
+        self._scan_retry_at = None
         self.pre_market_notified_today = False
         self.market_open_notified_today = False
         self.log_callback("Daily data reset completed")
         
     def run(self):
         """Main loop for the trading bot."""
+        asyncio.run(self.run_async())
+    
+    def stop(self):
+        """Stops the run loop from any thread, waking it if it is asleep."""
+        self.should_run = False
+        wakeup = self._wakeup
+        if wakeup is not None:
+            loop, wake = wakeup
+            try:
+                loop.call_soon_threadsafe(wake.set)
+            except RuntimeError:
+                # The loop already closed on its own
+                pass
+    
+    @staticmethod
+    async def _sleep(wake: asyncio.Event, seconds: float):
+        """Sleeps for `seconds`, returning early if stop() sets `wake`."""
+        try:
+            await asyncio.wait_for(wake.wait(), timeout=max(0.0, seconds))
+        except asyncio.TimeoutError:
+            pass
+        # Each wake-up is consumed, so later sleeps wait again
+        wake.clear()
+    
+    async def run_async(self):
+        """Event-loop version of the main loop; blocking fetches run in worker threads."""
+        if self._wakeup is not None:
+            self.log_callback("ORBS Trading Bot is already running")
+            return
+        
+        wakeup = self._wakeup = (asyncio.get_running_loop(), asyncio.Event())
+        wake = wakeup[1]
+        
         self.log_callback("ORBS Trading Bot started")
         self.log_callback(f"Watching symbols: {', '.join(self.symbols)}")
         self.log_callback(f"Execution timeframes: {', '.join(self.execution_timeframes)}")
         
         last_update_day = None
         orbs_calculated_today = False
+        notifier = self.notification_service
         
+        await notifier.start_async()
         try:
             while self.should_run:
-                current_time = datetime.now()
+                current_time = datetime.now(EASTERN_TZ)
                 current_day = current_time.date()
                 
                 if last_update_day and current_day != last_update_day:
@@ -476,54 +1124,55 @@ Buy {signal_type} options on Robinhood
                     orbs_calculated_today = False
                     
                 last_update_day = current_day
+                self._ensure_session_times(current_time)
                 
-                if not self.is_market_hours():
+                # The alerts fire on the first pass inside their window, so a
+                # late wake-up still sends them
+                if not self.is_market_hours(current_time):
 
                     if (
-                        current_time.hour == 9
-                        and current_time.minute == 0
+                        current_time.weekday() < 5
+                        and self._pre_market_dt <= current_time < self._session_open_dt
                         and not self.pre_market_notified_today
                     ):
-                        pre_market_message = f"🔔 Market opens in 30 minutes! Time to get ready to watch {', '.join(self.symbols)}."
-                        self.notification_service.notify("⏰ Pre-Market Alert", pre_market_message)
+                        minutes_to_open = round((self._session_open_dt - current_time).total_seconds() / 60)
+                        pre_market_message = f"🔔 Market opens in {minutes_to_open} minutes! Time to get ready to watch {', '.join(self.symbols)}."
+                        notifier.notify("⏰ Pre-Market Alert", pre_market_message)
                         self.pre_market_notified_today = True
                         
-                    self.log_callback("Market closed. Waiting...")
-                    time.sleep(300)
+                    # Nothing happens before the pre-market alert, the open or
+                    # the next day's reset, so sleep straight through to it
+                    wait = self.seconds_until_next_session_event(current_time)
+                    self.log_callback(f"Market closed. Waiting {wait / 60:.0f} minutes...")
+                    await self._sleep(wake, wait)
                     continue
 
                 if (
-                    current_time.hour == 9
-                    and current_time.minute == 30
+                    current_time < self._orb_end_dt
                     and not self.market_open_notified_today
                 ):
                     market_open_message = f"🟢 The market is officially open! The ORBS bot is now waiting for the 30-minute range to form for {', '.join(self.symbols)}."
-                    self.notification_service.notify("🎉 Market Open!", market_open_message)
+                    notifier.notify("🎉 Market Open!", market_open_message)
                     self.market_open_notified_today = True
                 
-                market_open_time = current_time.replace(
-                    hour=self.market_open_hours,
-                    minute=self.market_open_minute,
-                    second=0,
-                    microsecond=0
-                )
-                orb_end_time = market_open_time + timedelta(minutes=self.orb_minutes)
+                orb_end_time = self._orb_end_dt
                 
                 if current_time >= orb_end_time and not orbs_calculated_today:
                     self.log_callback("Calculating ORBS levels...")
-                    self.update_orbs_levels()
+                    await asyncio.to_thread(self.update_orbs_levels, current_time)
                     orbs_calculated_today = True
                     self.last_status_update_time = current_time 
                     
                     if self.orbs_levels:
-                        levels_msg = "📊 Today's ORBS Levels:\n"
-                        for symbol, orbs in self.orbs_levels.items():
-                            levels_msg += f"\n{symbol}:"
-                            levels_msg += f"\n  • High: ${orbs.orb_high:.2f}"
-                            levels_msg += f"\n  • Low: ${orbs.orb_low:.2f}"
-                            levels_msg += f"\n  • Width: ${orbs.orb_width:.2f}"
+                        levels_msg = "📊 Today's ORBS Levels:\n" + "".join(
+                            f"\n{symbol}:"
+                            f"\n  • High: ${orbs.orb_high:.2f}"
+                            f"\n  • Low: ${orbs.orb_low:.2f}"
+                            f"\n  • Width: ${orbs.orb_width:.2f}"
+                            for symbol, orbs in self.orbs_levels.items()
+                        )
                             
-                        self.notification_service.notify("🎯 ORBS Levels Calculated", levels_msg)
+                        notifier.notify("🎯 ORBS Levels Calculated", levels_msg)
                         
                 if orbs_calculated_today and self.orbs_levels:
                     if (
@@ -532,25 +1181,35 @@ Buy {signal_type} options on Robinhood
                     ):
                         self.last_status_update_time = current_time
                         
+                        current_prices = await asyncio.to_thread(self.get_current_prices, list(self.orbs_levels))
+                        
                         for symbol, orbs in self.orbs_levels.items():
-                            current_price = self.get_current_price(symbol)
+                            current_price = current_prices.get(symbol)
                             if current_price:
-                                status_msg = f"🔍 Current status for {symbol}:\n"
-                                status_msg += f"  • Current Price: ${current_price:.2f}\n"
-                                status_msg += f"  • ORB High: ${orbs.orb_high:.2f}\n"
-                                status_msg += f"  • ORB Low: ${orbs.orb_low:.2f}"
+                                status_msg = (
+                                    f"🔍 Current status for {symbol}:\n"
+                                    f"  • Current Price: ${current_price:.2f}\n"
+                                    f"  • ORB High: ${orbs.orb_high:.2f}\n"
+                                    f"  • ORB Low: ${orbs.orb_low:.2f}"
+                                )
                                 self.log_callback(status_msg)
                                 
-                    signals = self.scan_orbs_levels()
+                    signals = await asyncio.to_thread(self.scan_orbs_levels, current_time)
                     
                     if signals:
                         self.log_callback(f"Generated {len(signals)} signals")
                 
-                time.sleep(10)
+                # Nothing new can appear before the next bar closes
+                await self._sleep(wake, self.seconds_until_next_bar())
                 
         except Exception as e:
             self.log_callback(f"Unexpected error: {e}")
             self.should_run = False 
+        finally:
+            # Only release this run's own wake-up
+            if self._wakeup is wakeup:
+                self._wakeup = None
+            await notifier.close_async()
             
 if __name__ == "__main__":
     